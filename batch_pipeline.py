@@ -0,0 +1,253 @@
+import argparse
+import csv
+import glob
+import os
+import re
+import time
+from multiprocessing import Pool
+import numpy as np
+from convex_hull import ConvexHull3D
+from utils import simplify_mesh, normalize_mesh
+
+
+MESH_EXTS = ('.ply', '.obj', '.off', '.stl', '.gltf', '.glb')
+
+SUMMARY_FIELDS = [
+    'file', 'status', 'hull_file', 'num_vertices', 'num_faces', 'hull_vertices', 'hull_faces',
+    't_load', 't_simplify', 't_normalize', 't_hull', 't_save', 't_total', 'message',
+]
+
+# Hull files written by this pipeline (and by convex_hull.py in out/), e.g. bunny_sim32_convhull_n.obj
+HULL_NAME_RE = re.compile(r'_convhull(_n)?$')
+# Meshes saved by this pipeline with --save_mesh, e.g. bunny_sim32_n.ply
+MESH_NAME_RE = re.compile(r'(_sim\d+(_n)?|_n)$')
+
+
+def _is_under(path, directory):
+    path = os.path.realpath(path)
+    directory = os.path.realpath(directory)
+    return os.path.commonpath([path, directory]) == directory
+
+
+def _is_output(path, out_dir):
+    '''
+    Whether a file looks like an output of this pipeline: a convex hull, a temporary
+    file, or a saved mesh inside out_dir
+    '''
+    name = os.path.basename(path)
+    stem = os.path.splitext(name)[0]
+    if name.startswith('.') or HULL_NAME_RE.search(stem):
+        return True
+    return bool(MESH_NAME_RE.search(stem)) and _is_under(path, out_dir)
+
+
+def collect_files(inputs, out_dir):
+    '''
+    Expand directories (recursively) and glob patterns into a sorted list of mesh files.
+    Outputs of this pipeline are skipped, unless a file is named explicitly.
+    '''
+    files = set()
+    for item in inputs:
+        if os.path.isfile(item):
+            files.add(os.path.normpath(item))
+            continue
+
+        if os.path.isdir(item):
+            candidates = []
+            for dirpath, _, filenames in os.walk(item):
+                candidates.extend(os.path.join(dirpath, name) for name in filenames)
+        else:
+            candidates = glob.glob(item, recursive=True)
+
+        for path in candidates:
+            if not os.path.isfile(path) or os.path.splitext(path)[1].lower() not in MESH_EXTS:
+                continue
+            if _is_output(path, out_dir):
+                continue
+            files.add(os.path.normpath(path))
+
+    return sorted(files)
+
+
+def output_paths(input_filename, root, out_dir, fineness, normalize):
+    '''
+    Output paths follow the naming of the single-file tools and mirror the input's
+    directory relative to root, so they don't depend on which other files are in the run,
+    e.g., with root 'assets', assets/a/bunny.ply -> out/a/bunny_sim32_n.ply (mesh),
+    out/a/bunny_sim32_convhull_n.obj (hull)
+    '''
+    stem, ext = os.path.splitext(os.path.basename(input_filename))
+    rel_dir = os.path.relpath(os.path.dirname(os.path.abspath(input_filename)), os.path.abspath(root))
+    sim_tag = '_sim%s' % fineness if fineness > 0 else ''
+    suffix = '_n' if normalize else ''
+
+    mesh_path = os.path.normpath(os.path.join(out_dir, rel_dir, stem + sim_tag + suffix + ext))
+    hull_path = os.path.normpath(os.path.join(out_dir, rel_dir, stem + sim_tag + '_convhull' + suffix + '.obj'))
+    return mesh_path, hull_path
+
+
+def is_up_to_date(input_filename, outputs):
+    src_mtime = os.path.getmtime(input_filename)
+    for path in outputs:
+        if not os.path.exists(path) or os.path.getmtime(path) < src_mtime:
+            return False
+    return True
+
+
+def write_atomic(path, write_fn):
+    '''
+    Write through a temporary file in the same directory and move it into place,
+    so that an interrupted write never leaves a truncated file that looks up to date
+    @param write_fn
+        Called with the temporary path (which keeps the extension of path), returns success
+    '''
+    dirname, name = os.path.split(path)
+    stem, ext = os.path.splitext(name)
+    tmp_path = os.path.join(dirname, '.%s.tmp%s%s' % (stem, os.getpid(), ext))
+    try:
+        if not write_fn(tmp_path):
+            raise IOError('failed to write %s' % path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def process_file(job):
+    '''
+    Run simplification, normalization and hull construction on one mesh in memory
+    @param job
+        type: tuple
+        (input_filename, mesh_path, hull_path, fineness, normalize, save_mesh)
+    @return
+        type: dict
+        A summary record (see SUMMARY_FIELDS)
+    '''
+    input_filename, mesh_path, hull_path, fineness, do_normalize, save_mesh = job
+    record = {'file': input_filename, 'hull_file': hull_path}
+
+    t_start = time.time()
+    try:
+        import open3d as o3d
+
+        t0 = time.time()
+        mesh = o3d.io.read_triangle_mesh(input_filename)
+        if mesh.is_empty():
+            raise IOError('failed to read %s or the mesh is empty' % input_filename)
+        record['t_load'] = time.time() - t0
+
+        if fineness > 0:
+            t0 = time.time()
+            mesh = simplify_mesh(mesh, fineness)
+            if mesh.is_empty():
+                raise ValueError('mesh is empty after simplification')
+            record['t_simplify'] = time.time() - t0
+
+        if do_normalize:
+            t0 = time.time()
+            mesh = normalize_mesh(mesh)
+            record['t_normalize'] = time.time() - t0
+
+        vtxs = np.asarray(mesh.vertices)
+        record['num_vertices'] = vtxs.shape[0]
+        record['num_faces'] = np.asarray(mesh.triangles).shape[0]
+
+        t0 = time.time()
+        convhull = ConvexHull3D(vtxs, show_progress=False)
+        _, triangles = convhull.to_arrays()
+        record['t_hull'] = time.time() - t0
+        record['hull_vertices'] = np.unique(triangles).shape[0]
+        record['hull_faces'] = triangles.shape[0]
+
+        t0 = time.time()
+        if save_mesh:
+            write_atomic(mesh_path, lambda path: o3d.io.write_triangle_mesh(path, mesh))
+        write_atomic(hull_path, convhull.save)
+        record['t_save'] = time.time() - t0
+
+        record['status'] = 'done'
+    except Exception as e:
+        record['status'] = 'failed'
+        record['message'] = '%s: %s' % (type(e).__name__, e)
+
+    record['t_total'] = time.time() - t_start
+    return record
+
+
+
+if __name__ == '__main__':
+    # Arguments
+    parser = argparse.ArgumentParser(description='Simplify, normalize and compute convex hulls for a batch of meshes.')
+    parser.add_argument('inputs', type=str, nargs='+', help='Mesh files, directories (searched recursively) or glob patterns.')
+    parser.add_argument('--out_dir', type=str, default='out', help='The output directory.')
+    parser.add_argument('--root', type=str, default='', help='Mirror input directories relative to this directory under out_dir. (default: the working directory)')
+    parser.add_argument('--fineness', type=int, default=32, help='The fineness of simplification (0 to skip).')
+    parser.add_argument('--no_normalize', action='store_true', help='Skip normalization.')
+    parser.add_argument('--save_mesh', action='store_true', help='Also save the simplified/normalized meshes.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='The number of worker processes.')
+    parser.add_argument('--force', action='store_true', help='Reprocess files whose outputs are up to date.')
+    parser.add_argument('--summary', type=str, default='', help='The summary CSV path. (default: <out_dir>/summary.csv)')
+    args = parser.parse_args()
+
+    try:
+        import open3d
+    except ImportError as e:
+        parser.error('Open3D is required to read and write meshes (%s)' % e)
+
+    do_normalize = not args.no_normalize
+    root = args.root or os.getcwd()
+    files = collect_files(args.inputs, args.out_dir)
+    print('Found %s mesh files' % len(files))
+    if not files:
+        parser.error('no mesh files found in %s' % ' '.join(args.inputs))
+
+    outputs_of = {}
+    owners = {}
+    for input_filename in files:
+        if not _is_under(input_filename, root):
+            parser.error('%s is not under the root %s (see --root)' % (input_filename, root))
+
+        mesh_path, hull_path = output_paths(input_filename, root, args.out_dir, args.fineness, do_normalize)
+        for path in (mesh_path, hull_path):
+            if os.path.realpath(path) == os.path.realpath(input_filename):
+                parser.error('output %s would overwrite its input' % path)
+            if path in owners:
+                parser.error('%s and %s map to the same output %s' % (owners[path], input_filename, path))
+            owners[path] = input_filename
+        outputs_of[input_filename] = (mesh_path, hull_path)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    summary_path = args.summary or os.path.join(args.out_dir, 'summary.csv')
+
+    # Rows are flushed as they arrive, so an interrupted run still leaves a summary
+    with open(summary_path, 'w', newline='') as summary_file:
+        writer = csv.DictWriter(summary_file, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+
+        jobs = []
+        num_skipped = 0
+        for input_filename in files:
+            mesh_path, hull_path = outputs_of[input_filename]
+            outputs = [hull_path] + ([mesh_path] if args.save_mesh else [])
+            if not args.force and is_up_to_date(input_filename, outputs):
+                writer.writerow({'file': input_filename, 'status': 'skipped', 'hull_file': hull_path})
+                num_skipped += 1
+                continue
+            os.makedirs(os.path.dirname(hull_path), exist_ok=True)
+            jobs.append((input_filename, mesh_path, hull_path, args.fineness, do_normalize, args.save_mesh))
+        summary_file.flush()
+
+        print('Processing %s files (%s up to date) with %s workers...' % (len(jobs), num_skipped, args.workers))
+
+        t0 = time.time()
+        with Pool(processes=max(1, args.workers)) as pool:
+            for i, record in enumerate(pool.imap_unordered(process_file, jobs)):
+                if record['status'] == 'failed':
+                    print('WARNING: %s: %s' % (record['file'], record['message']))
+                else:
+                    print('[%s/%s] %s: %s hull faces, %.3fs' % (i + 1, len(jobs), record['file'], record['hull_faces'], record['t_total']))
+                writer.writerow(record)
+                summary_file.flush()
+        print('Time consumed: %ss' % (time.time() - t0))
+
+    print('Summary saved to %s' % summary_path)
@@ -1,33 +1,81 @@
 import numpy as np
-import open3d as o3d
 import math
 from utils import endpoint_key, Edge, Face
 
 
-class RigidBody():
-    def __init__(self, mesh, conv_mesh):
-        self.mesh = mesh
-        self.mesh.compute_vertex_normals()
-        self.convhull = conv_mesh
-        self.convhull.compute_triangle_normals()
-        self.convhull.remove_duplicated_vertices()
-        self.convhull.remove_duplicated_triangles()
+def _face_normals(vertices, faces):
+    '''
+    Compute unit normals of triangular faces
+    '''
+    normals = np.cross(vertices[faces[:, 1]] - vertices[faces[:, 0]], vertices[faces[:, 2]] - vertices[faces[:, 0]])
+    norms = np.linalg.norm(normals, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return normals / norms
+
+
+def _merge_duplicates(vertices, faces):
+    '''
+    Merge duplicated vertices and remove duplicated triangles
+    @return
+        vertices, faces and the indices of the kept input faces
+    '''
+    vertices, inverse = np.unique(vertices, axis=0, return_inverse=True)
+    faces = inverse.reshape(-1)[faces]
+    # Like Open3D, triangles are duplicates only if they match up to a rotation that
+    # keeps the winding, so the smallest index is rotated to the front
+    shift = np.argmin(faces, axis=1)[:, np.newaxis]
+    canonical = np.take_along_axis(faces, (shift + np.arange(3)) % 3, axis=1)
+    _, first_idx = np.unique(canonical, axis=0, return_index=True)
+    kept_idx = np.sort(first_idx)
+    return vertices, faces[kept_idx], kept_idx
+
+
+class ConvexBody():
+    '''
+    Pure-NumPy convex polyhedron used by SAT3D
+    @param vertices
+        vertices of the convex hull
+        type: np.array
+        shape: |V| x 3
+    @param faces
+        triangles of the convex hull (vertex indices)
+        type: np.array
+        shape: |F| x 3
+    @param face_normals
+        unit normals of the triangles, computed if not given
+        (kept in step with the faces that survive merging)
+        type: np.array
+        shape: |F| x 3
+    @param merge_duplicates
+        type: bool
+        Whether to merge duplicated vertices and triangles first
+    '''
+
+    def __init__(self, vertices, faces, face_normals=None, merge_duplicates=True):
+        # Copy the vertices so that translate() never moves the caller's array
+        vertices = np.array(vertices, dtype=np.float64)
+        faces = np.asarray(faces)
+        if merge_duplicates:
+            vertices, faces, kept_idx = _merge_duplicates(vertices, faces)
+            if face_normals is not None:
+                face_normals = np.asarray(face_normals)[kept_idx]
+        if face_normals is None:
+            face_normals = _face_normals(vertices, faces)
 
         # Faces, vertices, normals of the convex hull
-        self.faces = np.asarray(self.convhull.triangles)
-        self.vertices = np.asarray(self.convhull.vertices)
-        self.face_normals = np.asarray(self.convhull.triangle_normals)
+        self.faces = faces
+        self.vertices = vertices
+        self.face_normals = np.asarray(face_normals)
         self.edges, self.edges_gauss_map = self._build_edges()
 
     def get_max_bound(self):
-        return self.convhull.get_max_bound()
-    
+        return np.max(self.vertices, axis=0)
+
     def get_min_bound(self):
-        return self.convhull.get_min_bound()
+        return np.min(self.vertices, axis=0)
 
     def translate(self, t):
-        self.mesh.translate(t)
-        self.convhull.translate(t)
+        self.vertices += t
 
     def _build_edges(self):
         # Search for all edges and record their adjacent faces' normals
@@ -60,14 +108,52 @@ class RigidBody():
         return np.array(edges_list), np.array(gauss_map)
 
 
+class RigidBody(ConvexBody):
+    '''
+    Convex body backed by Open3D meshes (used for visualization)
+    @param mesh
+        type: o3d.geometry.TriangleMesh
+        The original mesh
+    @param conv_mesh
+        type: o3d.geometry.TriangleMesh
+        The convex hull of the mesh
+    '''
+
+    def __init__(self, mesh, conv_mesh):
+        self.mesh = mesh
+        self.mesh.compute_vertex_normals()
+        self.convhull = conv_mesh
+        self.convhull.compute_triangle_normals()
+        self.convhull.remove_duplicated_vertices()
+        self.convhull.remove_duplicated_triangles()
+
+        super().__init__(
+            np.asarray(self.convhull.vertices),
+            np.asarray(self.convhull.triangles),
+            np.asarray(self.convhull.triangle_normals),
+            merge_duplicates=False)
+        # Use a view of the Open3D buffer instead, so translating the meshes moves the vertices too
+        self.vertices = np.asarray(self.convhull.vertices)
+
+    def get_max_bound(self):
+        return self.convhull.get_max_bound()
+    
+    def get_min_bound(self):
+        return self.convhull.get_min_bound()
+
+    def translate(self, t):
+        self.mesh.translate(t)
+        self.convhull.translate(t)
+
+
 class SAT3D():
     '''
     Implementation of Separating Axis Theorem for 3D convex hulls
     @param obj1
-        type: RigidBody
+        type: ConvexBody
         The first collider
     @param obj2
-        type: RigidBody
+        type: ConvexBody
         The second collider
     @param num_chunks
         type: int
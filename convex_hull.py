@@ -1,9 +1,6 @@
 import argparse
 import numpy as np
-from tqdm import tqdm
-import open3d as o3d
 from utils import endpoint_key, Edge, Face
-import vis_convhull
 import time
 
 
@@ -77,6 +74,8 @@ class ConvexHull3D():
 
         iter_obj = range(5, len(vtxs))
         if self._show_progress:
+            # Imported lazily so that headless workers don't pay for tqdm
+            from tqdm import tqdm
             iter_obj = tqdm(iter_obj)
         
         for pi in iter_obj:
@@ -147,21 +146,39 @@ class ConvexHull3D():
             for new_face in new_faces:
                 self._add_face(*new_face)
 
-    def to_o3d_mesh(self):
+    def to_arrays(self):
+        '''
+        Export the convex hull as plain NumPy arrays
+        @return
+            vertices: np.array of shape |V| x 3 (all input vertices)
+            triangles: np.array of shape |F| x 3 (indices into vertices)
+        '''
         face_idx_ls = []
         for f_key in self.faces:
             f = self.faces[f_key]
             face_idx_ls.append([f.vertices[0], f.vertices[1], f.vertices[2]])
-        triangles = o3d.utility.Vector3iVector(face_idx_ls)
 
-        return o3d.geometry.TriangleMesh(o3d.utility.Vector3dVector(self._in_vtxs), triangles)
+        vertices = np.asarray(self._in_vtxs, dtype=np.float64).reshape(-1, 3)
+        triangles = np.asarray(face_idx_ls, dtype=np.int32).reshape(-1, 3)
+        return vertices, triangles
+
+    def to_o3d_mesh(self):
+        import open3d as o3d
+
+        vertices, triangles = self.to_arrays()
+        return o3d.geometry.TriangleMesh(o3d.utility.Vector3dVector(vertices), o3d.utility.Vector3iVector(triangles))
 
     def save(self, path):
+        import open3d as o3d
+
         return o3d.io.write_triangle_mesh(path, self.to_o3d_mesh())
 
 
 
 if __name__ == '__main__':
+    import open3d as o3d
+    import vis_convhull
+
     # Arguments
     parser = argparse.ArgumentParser(description='Compute the convex hull of a 3D object.')
     parser.add_argument('--file', type=str, help='The target model file.')
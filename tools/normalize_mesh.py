@@ -1,6 +1,10 @@
 import open3d as o3d
 import argparse
-import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils import normalize_mesh
 
 
 if __name__ == '__main__':
@@ -14,8 +18,6 @@ if __name__ == '__main__':
     print('Output file:', output_filename)
 
     mesh = o3d.io.read_triangle_mesh(input_filename)
-    bbox = mesh.get_max_bound() - mesh.get_min_bound()
-    scale = 2 / bbox.min()
-    mesh.scale(scale, np.array([0, 0, 0]))
+    mesh = normalize_mesh(mesh)
 
     o3d.io.write_triangle_mesh(output_filename, mesh)
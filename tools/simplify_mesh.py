@@ -1,5 +1,10 @@
 import open3d as o3d
 import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils import simplify_mesh
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='A mesh simplifier.')
@@ -14,11 +19,6 @@ if __name__ == '__main__':
 
     mesh = o3d.io.read_triangle_mesh(input_filename)
 
-    voxel_size = max(mesh.get_max_bound() - mesh.get_min_bound()) / args.fineness
-    print(f'voxel_size = {voxel_size:e}')
-
-    mesh = mesh.simplify_vertex_clustering(
-        voxel_size=voxel_size,
-        contraction=o3d.geometry.SimplificationContraction.Average)
+    mesh = simplify_mesh(mesh, args.fineness)
 
     o3d.io.write_triangle_mesh(output_filename, mesh)
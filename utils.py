@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def endpoint_key(*arg):
     t = [str(a) for a in sorted(arg)]
     return '-'.join(t)
@@ -32,3 +35,27 @@ class Face():
 
         if len(self.vertices) > 3:
             print('WARNING: face(%s): non-triangular face' % endpoint_key(*self.vertices))
+
+
+def simplify_mesh(mesh, fineness):
+    '''
+    Simplify an Open3D mesh by vertex clustering, with voxel size = the longest bounding box extent / fineness
+    '''
+    import open3d as o3d
+
+    voxel_size = max(mesh.get_max_bound() - mesh.get_min_bound()) / fineness
+    return mesh.simplify_vertex_clustering(
+        voxel_size=voxel_size,
+        contraction=o3d.geometry.SimplificationContraction.Average)
+
+
+def normalize_mesh(mesh):
+    '''
+    Scale an Open3D mesh (in place) so that the shortest bounding box extent becomes 2
+    '''
+    bbox = mesh.get_max_bound() - mesh.get_min_bound()
+    if bbox.min() <= 0:
+        raise ValueError('cannot normalize a flat mesh (bounding box extent %s)' % bbox)
+    scale = 2 / bbox.min()
+    mesh.scale(scale, np.array([0, 0, 0]))
+    return mesh